@@ -2,33 +2,72 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import collections
+import concurrent.futures
+import itertools
 import json
 import hashlib
+import http.client
 import os
+import posixpath
 import re
+import shutil
+import stat
 import subprocess
 import sys
+import threading
 import time
-import urllib.error
+import urllib.parse
 import urllib.request
 import uuid
 import zipfile
+import zlib
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 
+try:
+    import deflate  # Optional libdeflate binding: pip install deflate
+except ImportError:
+    deflate = None
+
 
 DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
 DEFAULT_ARTIFACT_DIRNAME = ".codex-review"
+UPLOAD_CACHE_FILENAME = "upload-cache.json"
 DEFAULT_POLL_INTERVAL_SECONDS = 30
 DEFAULT_TIMEOUT_MINUTES = 90
 DEFAULT_MAX_ZIP_BYTES = 100 * 1024 * 1024  # 100 MiB
+ZIP_COPY_BUFFER_BYTES = 1024 * 1024  # 1 MiB
+DEFAULT_COMPRESSOR = "zlib"
+DEFAULT_JOBS = 1
+LIBDEFLATE_DEFAULT_LEVEL = 6
+MAX_COMPRESSION_LEVELS = {"zlib": 9, "libdeflate": 12}
+# Largest member compressed as a single in-memory buffer, by in-process libdeflate or in its own
+# worker batch. Larger members always stream through zlib in the main process.
+BUFFERED_MEMBER_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB
+# Worker batches hold up to this many input bytes; a larger file (up to BUFFERED_MEMBER_MAX_BYTES)
+# gets a batch of its own. At most PARALLEL_BATCHES_PER_JOB * jobs batches are in flight.
+PARALLEL_BATCH_BYTES = 8 * 1024 * 1024  # 8 MiB
+PARALLEL_BATCHES_PER_JOB = 2
+UPLOAD_CHUNK_BYTES = 1024 * 1024  # 1 MiB
+_IDEMPOTENT_HTTP_METHODS = frozenset({"GET", "HEAD", "DELETE"})
+
+# Already-compressed formats: DEFLATE only burns CPU on these, so they are stored as-is.
+_INCOMPRESSIBLE_EXTENSIONS = frozenset(
+    {
+        "7z", "bz2", "gif", "gz", "ico", "jar", "jpeg", "jpg", "mov", "mp4", "pack", "pdf",
+        "png", "tgz", "webm", "webp", "whl", "woff", "woff2", "xz", "zip", "zst",
+    }
+)
 
 
 def _eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
-def _run_git(repo_root: Path, args: list[str]) -> bytes:
-    return subprocess.check_output(["git", "-C", str(repo_root), *args])
+def _run_git(repo_root: Path, args: list[str], *, stderr: int | None = None) -> bytes:
+    return subprocess.check_output(["git", "-C", str(repo_root), *args], stderr=stderr)
 
 
 def _git_repo_root(repo_path: Path) -> Path:
@@ -42,32 +81,38 @@ def _git_repo_root(repo_path: Path) -> Path:
     return Path(top)
 
 
-def _git_ls_files(repo_root: Path, extra_args: list[str]) -> list[str]:
-    raw = _run_git(repo_root, ["ls-files", "-z", *extra_args])
+def _git_ls_files(repo_root: Path, extra_args: list[str], *, stderr: int | None = None) -> list[str]:
+    raw = _run_git(repo_root, ["ls-files", "-z", *extra_args], stderr=stderr)
     paths = [p.decode("utf-8", errors="surrogateescape") for p in raw.split(b"\0") if p]
     return paths
 
 
 def _iter_repo_files_excluding_ignored(repo_root: Path) -> list[Path]:
+    try:
+        rels = _git_ls_files(
+            repo_root,
+            ["--cached", "--others", "--exclude-standard", "--deduplicate"],
+            stderr=subprocess.DEVNULL,
+        )
+        return [repo_root / rel for rel in rels]
+    except subprocess.CalledProcessError:
+        pass  # git < 2.31 has no --deduplicate; list tracked/untracked separately.
+
     tracked = _git_ls_files(repo_root, [])
     untracked = _git_ls_files(repo_root, ["--others", "--exclude-standard"])
-    seen: set[str] = set()
-    ordered: list[Path] = []
-    for rel in [*tracked, *untracked]:
-        if not rel or rel in seen:
-            continue
-        seen.add(rel)
-        ordered.append(repo_root / rel)
-    return ordered
+    # dict.fromkeys dedups (e.g. unmerged index stages) while keeping git's order.
+    return [repo_root / rel for rel in dict.fromkeys([*tracked, *untracked])]
 
 
 _HTTP_URL_WITH_USERINFO = re.compile(r"^(https?://)([^/@\s]+@)(.+)$")
+_EXTRAHEADER_RE = re.compile(r"(?i)\bextraheader\b")
+_URL_LINE_RE = re.compile(r"^(\s*url\s*=\s*)(\S+)(\s*)$")
 
 
 def _sanitize_git_config(raw: str) -> str:
     sanitized_lines: list[str] = []
     for line in raw.splitlines():
-        if re.search(r"(?i)\bextraheader\b", line):
+        if _EXTRAHEADER_RE.search(line):
             if "=" in line:
                 prefix, _ = line.split("=", 1)
                 sanitized_lines.append(f"{prefix}= <redacted>")
@@ -75,7 +120,7 @@ def _sanitize_git_config(raw: str) -> str:
                 sanitized_lines.append("<redacted>")
             continue
 
-        match = re.search(r"^(\s*url\s*=\s*)(\S+)(\s*)$", line)
+        match = _URL_LINE_RE.match(line)
         if match:
             prefix, url, suffix = match.groups()
             url_match = _HTTP_URL_WITH_USERINFO.match(url)
@@ -90,9 +135,83 @@ def _sanitize_git_config(raw: str) -> str:
     return "\n".join(sanitized_lines) + trailing_newline
 
 
-def _zip_add_file(zip_file: zipfile.ZipFile, repo_root: Path, file_path: Path, arcname: str) -> None:
+class _BundleZipFile(zipfile.ZipFile):
+    def __init__(self, path: Path, *, compressor: str, level: int | None = None) -> None:
+        compression = zipfile.ZIP_STORED if compressor == "store" else zipfile.ZIP_DEFLATED
+        # Members that stream through zlib (even with libdeflate selected) need a zlib-valid level.
+        zlib_level = None if level is None else min(level, MAX_COMPRESSION_LEVELS["zlib"])
+        super().__init__(path, "w", compression=compression, compresslevel=zlib_level)
+        self.compressor = compressor
+        self.level = level
+
+    def write_compressed(self, info: zipfile.ZipInfo, crc: int, data: bytes) -> None:
+        # Mirrors ZipFile._open_to_write + _ZipWriteFile.close for a payload that was
+        # compressed outside zipfile (info.file_size must already be set).
+        info.CRC = crc
+        info.compress_size = len(data)
+        info.flag_bits = 0x00
+        if not info.external_attr:
+            info.external_attr = 0o600 << 16
+        zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+        with self._lock:
+            if self._writing:
+                raise ValueError("Can't write to ZIP archive while an open writing handle exists.")
+            self.fp.seek(self.start_dir)
+            info.header_offset = self.fp.tell()
+            self._writecheck(info)
+            self._didModify = True
+            self.fp.write(info.FileHeader(zip64))
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(info)
+            self.NameToInfo[info.filename] = info
+
+
+def _zip_info_for_file(zip_file: _BundleZipFile, arcname: str, st: os.stat_result) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+    info.external_attr = (st.st_mode & 0xFFFF) << 16
+    info.file_size = st.st_size
+    info.compress_type = zip_file.compression
+    info._compresslevel = zip_file.compresslevel
+    extension = posixpath.splitext(arcname)[1][1:].lower()
+    if info.compress_type == zipfile.ZIP_DEFLATED and extension in _INCOMPRESSIBLE_EXTENSIONS:
+        info.compress_type = zipfile.ZIP_STORED
+    return info
+
+
+def _deflate_member(path: str, compressor: str, level: int | None) -> tuple[int, int, bytes] | None:
+    # Runs in worker processes too: returns (crc32, file_size, raw DEFLATE bytes), or None if missing.
+    try:
+        with open(path, "rb") as src:
+            data = src.read()
+    except FileNotFoundError:
+        return None
+    if compressor == "libdeflate":
+        if level is None:
+            level = LIBDEFLATE_DEFAULT_LEVEL
+        return deflate.crc32(data), len(data), deflate.deflate_compress(data, level)
+    if level is None:
+        level = zlib.Z_DEFAULT_COMPRESSION
+    compress = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return zlib.crc32(data), len(data), compress.compress(data) + compress.flush()
+
+
+def _deflate_members(paths: list[str], compressor: str, level: int | None) -> list[tuple[int, int, bytes] | None]:
+    return [_deflate_member(path, compressor, level) for path in paths]
+
+
+def _zip_add_file(
+    zip_file: _BundleZipFile,
+    repo_root: Path,
+    file_path: Path,
+    arcname: str,
+    st: os.stat_result | None = None,
+) -> None:
+    # `st` is the caller's os.lstat() result, if it already has one.
     try:
-        if file_path.is_symlink():
+        if st is None:
+            st = os.lstat(file_path)
+        if stat.S_ISLNK(st.st_mode):
             link_target = os.readlink(file_path)
             info = zipfile.ZipInfo(arcname)
             info.create_system = 3  # Unix
@@ -100,13 +219,103 @@ def _zip_add_file(zip_file: zipfile.ZipFile, repo_root: Path, file_path: Path, a
             zip_file.writestr(info, link_target)
             return
 
-        zip_file.write(file_path, arcname=arcname)
+        info = _zip_info_for_file(zip_file, arcname, st)
+        if (
+            zip_file.compressor == "libdeflate"
+            and info.compress_type == zipfile.ZIP_DEFLATED
+            and st.st_size <= BUFFERED_MEMBER_MAX_BYTES
+        ):
+            result = _deflate_member(str(file_path), zip_file.compressor, zip_file.level)
+            if result is None:
+                raise FileNotFoundError(file_path)
+            crc, info.file_size, compressed = result
+            zip_file.write_compressed(info, crc, compressed)
+            return
+
+        with open(file_path, "rb", buffering=0) as src, zip_file.open(info, "w") as dst:
+            shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER_BYTES)
     except FileNotFoundError:
         _eprint(f"[WARN] Skipping missing file: {file_path}")
 
 
+def _zip_add_files_parallel(
+    zip_file: _BundleZipFile,
+    repo_root: Path,
+    members: list[tuple[Path, str, os.stat_result]],
+    jobs: int,
+) -> None:
+    batches: list[list[tuple[Path, zipfile.ZipInfo]]] = []
+    in_process: list[tuple[Path, str, os.stat_result]] = []
+    batch_bytes = 0
+    for file_path, arcname, st in members:
+        if stat.S_ISREG(st.st_mode) and st.st_size <= BUFFERED_MEMBER_MAX_BYTES:
+            info = _zip_info_for_file(zip_file, arcname, st)
+            if info.compress_type == zipfile.ZIP_DEFLATED:
+                # Files over PARALLEL_BATCH_BYTES always overflow the open batch, so they get their own.
+                if not batches or batch_bytes + st.st_size > PARALLEL_BATCH_BYTES:
+                    batches.append([])
+                    batch_bytes = 0
+                batches[-1].append((file_path, info))
+                batch_bytes += st.st_size
+                continue
+        in_process.append((file_path, arcname, st))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+
+        def submit(batch: list[tuple[Path, zipfile.ZipInfo]]) -> concurrent.futures.Future:
+            paths = [str(file_path) for file_path, _ in batch]
+            return pool.submit(_deflate_members, paths, zip_file.compressor, zip_file.level)
+
+        # Submit as we drain, in order, so finished-but-unwritten results cannot pile up.
+        remaining = iter(batches)
+        pending = collections.deque(
+            (batch, submit(batch)) for batch in itertools.islice(remaining, jobs * PARALLEL_BATCHES_PER_JOB)
+        )
+        # Symlinks, stored and streamed members are written from this process while the workers run.
+        for file_path, arcname, st in in_process:
+            _zip_add_file(zip_file, repo_root, file_path, arcname, st)
+
+        while pending:
+            batch, future = pending.popleft()
+            for (file_path, info), result in zip(batch, future.result()):
+                if result is None:
+                    _eprint(f"[WARN] Skipping missing file: {file_path}")
+                    continue
+                crc, info.file_size, compressed = result
+                zip_file.write_compressed(info, crc, compressed)
+            next_batch = next(remaining, None)
+            if next_batch is not None:
+                pending.append((next_batch, submit(next_batch)))
+
+
+def _iter_tree_files(root: str | Path, rel_prefix: str) -> Iterator[tuple[os.DirEntry, str]]:
+    # Depth-first scandir walk yielding (entry, arcname) for every non-directory, sorted per directory.
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except (FileNotFoundError, PermissionError):
+        # e.g. a .git/objects/xx dir pruned by a concurrent `git gc`, or an unreadable dir.
+        _eprint(f"[WARN] Skipping unreadable directory: {root}")
+        return
+    for entry in entries:
+        rel = f"{rel_prefix}/{entry.name}"
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_tree_files(entry.path, rel)
+        else:
+            yield entry, rel
+
+
+def _zip_add_dir_entry(zip_file: _BundleZipFile, repo_root: Path, entry: os.DirEntry, arcname: str) -> None:
+    try:
+        st = entry.stat(follow_symlinks=False)
+    except FileNotFoundError:
+        _eprint(f"[WARN] Skipping missing file: {entry.path}")
+        return
+    _zip_add_file(zip_file, repo_root, Path(entry.path), arcname, st)
+
+
 def _zip_add_git_dir(
-    zip_file: zipfile.ZipFile,
+    zip_file: _BundleZipFile,
     repo_root: Path,
     include_git: str,
 ) -> None:
@@ -138,17 +347,15 @@ def _zip_add_git_dir(
             if not root.exists():
                 continue
             if root.is_dir():
-                for child in sorted(root.rglob("*")):
-                    if child.is_dir():
-                        continue
-                    rel = child.relative_to(repo_root).as_posix()
-                    _zip_add_file(zip_file, repo_root, child, rel)
+                for entry, rel in _iter_tree_files(root, root.relative_to(repo_root).as_posix()):
+                    _zip_add_dir_entry(zip_file, repo_root, entry, rel)
             else:
                 rel = root.relative_to(repo_root).as_posix()
                 if rel == ".git/config":
                     try:
                         sanitized = _sanitize_git_config(root.read_text(errors="replace"))
-                        zip_file.writestr(rel, sanitized)
+                        # Keep the on-disk mtime so unchanged repos produce byte-identical bundles.
+                        zip_file.writestr(_zip_info_for_file(zip_file, rel, root.stat()), sanitized)
                     except OSError:
                         _eprint("[WARN] Failed to read .git/config; skipping.")
                 else:
@@ -158,13 +365,10 @@ def _zip_add_git_dir(
     if include_git != "full":
         raise ValueError(f"Unknown --include-git value: {include_git}")
 
-    for child in sorted(git_path.rglob("*")):
-        if child.is_dir():
-            continue
-        if child.name.endswith(".lock"):
+    for entry, rel in _iter_tree_files(git_path, ".git"):
+        if entry.name.endswith(".lock"):
             continue
-        rel = child.relative_to(repo_root).as_posix()
-        _zip_add_file(zip_file, repo_root, child, rel)
+        _zip_add_dir_entry(zip_file, repo_root, entry, rel)
 
 
 def _create_repo_bundle_zip(
@@ -172,24 +376,51 @@ def _create_repo_bundle_zip(
     artifact_dir: Path,
     include_git: str,
     max_zip_bytes: int,
+    compressor: str = DEFAULT_COMPRESSOR,
+    compression_level: int | None = None,
+    jobs: int = DEFAULT_JOBS,
 ) -> Path:
     artifact_dir.mkdir(parents=True, exist_ok=True)
     zip_path = artifact_dir / "bundle.zip"
 
+    if compressor == "libdeflate" and deflate is None:
+        _eprint("[WARN] libdeflate binding not installed (pip install deflate); falling back to zlib.")
+        compressor = "zlib"
+        if compression_level is not None:
+            compression_level = min(compression_level, MAX_COMPRESSION_LEVELS["zlib"])
+
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    # Exclude the artifact dir with a plain string prefix check instead of a per-file relative_to().
+    artifact_prefix: str | None = None
+    if artifact_dir.is_relative_to(repo_root):
+        artifact_rel = artifact_dir.relative_to(repo_root).as_posix()
+        artifact_prefix = "" if artifact_rel == "." else f"{artifact_rel}/"
+
     files = _iter_repo_files_excluding_ignored(repo_root)
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+    with _BundleZipFile(zip_path, compressor=compressor, level=compression_level) as zf:
+        members: list[tuple[Path, str, os.stat_result]] = []
         for file_path in files:
-            if file_path.is_dir():
+            rel = file_path.relative_to(repo_root).as_posix()
+            if artifact_prefix is not None and rel.startswith(artifact_prefix):
+                continue
+            if rel.startswith(".git/") or rel == ".git":
                 continue
             try:
-                file_path.relative_to(artifact_dir)
+                st = os.lstat(file_path)
+            except FileNotFoundError:
+                _eprint(f"[WARN] Skipping missing file: {file_path}")
                 continue
-            except ValueError:
-                pass
-            rel = file_path.relative_to(repo_root).as_posix()
-            if rel.startswith(".git/") or rel == ".git":
+            if stat.S_ISDIR(st.st_mode):
                 continue
-            _zip_add_file(zf, repo_root, file_path, rel)
+            members.append((file_path, rel, st))
+
+        if jobs > 1 and compressor != "store":
+            _zip_add_files_parallel(zf, repo_root, members, jobs)
+        else:
+            for file_path, rel, st in members:
+                _zip_add_file(zf, repo_root, file_path, rel, st)
 
         _zip_add_git_dir(zf, repo_root, include_git)
 
@@ -202,10 +433,103 @@ def _create_repo_bundle_zip(
     return zip_path
 
 
+def _write_json(path: Path, data: object) -> None:
+    # json.dump encodes incrementally into the file instead of building one big str first.
+    with path.open("w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def _sha256_file(path: Path) -> str:
+    with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := f.read(ZIP_COPY_BUFFER_BYTES):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _load_upload_cache(cache_path: Path) -> dict[str, str]:
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(k, str) and isinstance(v, str)}
+
+
+def _save_upload_cache(cache_path: Path, cache: dict[str, str]) -> None:
+    try:
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    except OSError:
+        _eprint(f"[WARN] Failed to write upload cache: {cache_path}")
+
+
 class OpenAIClient:
     def __init__(self, api_key: str, base_url: str) -> None:
         self._api_key = api_key
         self._base_url = base_url.rstrip("/")
+        parsed = urllib.parse.urlsplit(self._base_url)
+        self._scheme = parsed.scheme
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path
+
+        # One keep-alive connection is reused for upload, polling and cleanup.
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+        # Set by _connection: plain-HTTP proxies take absolute-form targets plus Proxy-Authorization.
+        self._target_prefix = self._base_path
+        self._proxy_headers: dict[str, str] = {}
+
+    def _connection(self, timeout_seconds: int) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            host = urllib.parse.urlsplit(self._base_url).hostname or ""
+            proxy = urllib.request.getproxies().get(self._scheme)
+            if proxy and not urllib.request.proxy_bypass(host):
+                if "://" not in proxy:
+                    proxy = f"http://{proxy}"  # e.g. HTTPS_PROXY=proxy:3128
+                parsed_proxy = urllib.parse.urlsplit(proxy)
+                proxy_headers: dict[str, str] = {}
+                if parsed_proxy.username is not None:
+                    credentials = (
+                        f"{urllib.parse.unquote(parsed_proxy.username)}:"
+                        f"{urllib.parse.unquote(parsed_proxy.password or '')}"
+                    )
+                    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+                    proxy_headers["Proxy-Authorization"] = f"Basic {token}"
+                self._conn = conn_cls(
+                    parsed_proxy.hostname or "",
+                    parsed_proxy.port or (443 if parsed_proxy.scheme == "https" else 80),
+                    timeout=timeout_seconds,
+                )
+                if self._scheme == "https":
+                    # HTTPS goes through a CONNECT tunnel, as urllib does.
+                    self._conn.set_tunnel(self._netloc, headers=proxy_headers)
+                    self._target_prefix = self._base_path
+                    self._proxy_headers = {}
+                else:
+                    # Plain HTTP is sent to the proxy in absolute form, as urllib does (no CONNECT).
+                    self._target_prefix = self._base_url
+                    self._proxy_headers = proxy_headers
+            else:
+                self._conn = conn_cls(self._netloc, timeout=timeout_seconds)
+                self._target_prefix = self._base_path
+                self._proxy_headers = {}
+        self._conn.timeout = timeout_seconds
+        if self._conn.sock is not None:
+            self._conn.sock.settimeout(timeout_seconds)
+        return self._conn
+
+    def _drop_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_connection()
 
     def _request(
         self,
@@ -213,28 +537,45 @@ class OpenAIClient:
         path: str,
         *,
         headers: dict[str, str] | None = None,
-        body: bytes | None = None,
+        body: bytes | Callable[[], Iterable[bytes]] | None = None,
         timeout_seconds: int = 60,
     ) -> tuple[int, bytes]:
+        # A callable body returns the chunks to stream (set Content-Length); it is re-invoked on retry.
         all_headers = {"Authorization": f"Bearer {self._api_key}"}
         if headers:
             all_headers.update(headers)
 
-        req = urllib.request.Request(
-            f"{self._base_url}{path}",
-            data=body,
-            headers=all_headers,
-            method=method,
-        )
-        try:
-            with urllib.request.urlopen(req, timeout=timeout_seconds) as resp:
-                return resp.getcode(), resp.read()
-        except urllib.error.HTTPError as e:
-            return e.code, e.read()
+        with self._lock:
+            while True:
+                reused = self._conn is not None
+                conn = self._connection(timeout_seconds)
+                sent = False
+                try:
+                    conn.request(
+                        method,
+                        f"{self._target_prefix}{path}",
+                        body=body() if callable(body) else body,
+                        headers={**all_headers, **self._proxy_headers},
+                    )
+                    sent = True
+                    resp = conn.getresponse()
+                    resp_body = resp.read()
+                except ConnectionError:
+                    self._drop_connection()
+                    # The server closed the idle keep-alive connection: retry once on a new one, unless the
+                    # request was fully written and is not idempotent (the server may already have run it).
+                    if reused and (not sent or method in _IDEMPOTENT_HTTP_METHODS):
+                        continue
+                    raise
+                except (OSError, http.client.HTTPException):
+                    self._drop_connection()
+                    raise
+                if resp.will_close:
+                    self._drop_connection()
+                return resp.status, resp_body
 
     def upload_zip(self, zip_path: Path, *, purpose: str = "assistants") -> str:
         boundary = f"----codex-{uuid.uuid4().hex}"
-        zip_bytes = zip_path.read_bytes()
 
         def part(name: str, value: str) -> bytes:
             return (
@@ -249,13 +590,25 @@ class OpenAIClient:
             "Content-Type: application/zip\r\n\r\n"
         ).encode("utf-8")
         closing = f"\r\n--{boundary}--\r\n".encode("utf-8")
-        body = b"".join([part("purpose", purpose), file_header, zip_bytes, closing])
+        prelude = part("purpose", purpose) + file_header
+        total = len(prelude) + zip_path.stat().st_size + len(closing)
+
+        # Stream the multipart body so the zip is never held in memory.
+        def body_chunks() -> Iterator[bytes]:
+            yield prelude
+            with zip_path.open("rb") as f:
+                while chunk := f.read(UPLOAD_CHUNK_BYTES):
+                    yield chunk
+            yield closing
 
         status, resp_body = self._request(
             "POST",
             "/files",
-            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
-            body=body,
+            headers={
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(total),
+            },
+            body=body_chunks,
             timeout_seconds=300,
         )
         if status < 200 or status >= 300:
@@ -266,6 +619,10 @@ class OpenAIClient:
             raise RuntimeError(f"Unexpected upload response (missing id): {data}")
         return str(file_id)
 
+    def file_exists(self, file_id: str) -> bool:
+        status, _ = self._request("GET", f"/files/{file_id}", timeout_seconds=60)
+        return 200 <= status < 300
+
     def delete_file(self, file_id: str) -> None:
         self._request("DELETE", f"/files/{file_id}", timeout_seconds=60)
 
@@ -346,22 +703,31 @@ def _wait_for_manual_response(
     timeout_minutes: int,
 ) -> str:
     deadline = time.time() + (timeout_minutes * 60)
+    last_seen_key: tuple[int, int] | None = None
     last_seen_digest: str | None = None
 
     while True:
         if time.time() > deadline:
             raise RuntimeError(f"Timed out waiting for manual response at: {response_path}")
 
-        if response_path.exists() and response_path.is_file():
+        try:
+            st = response_path.stat()
+        except OSError:
+            st = None
+
+        # Only re-read the file when its (mtime, size) changes; each idle poll is a single stat.
+        if st is not None and stat.S_ISREG(st.st_mode) and (st.st_mtime_ns, st.st_size) != last_seen_key:
             try:
-                text = response_path.read_text(errors="replace")
+                raw = response_path.read_bytes()
             except OSError:
                 time.sleep(max(1, poll_interval_seconds))
                 continue
+            last_seen_key = (st.st_mtime_ns, st.st_size)
 
-            digest = hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+            digest = hashlib.sha256(raw).hexdigest()
             if last_seen_digest != digest:
                 last_seen_digest = digest
+                text = raw.decode("utf-8", errors="replace")
                 if _extract_patch(text):
                     return text
                 if text.strip():
@@ -387,31 +753,34 @@ def _extract_output_text(response_json: dict) -> str:
     if isinstance(output_text, str) and output_text.strip():
         return output_text.strip()
 
-    texts: list[str] = []
-    for item in response_json.get("output", []) or []:
-        for content in item.get("content", []) or []:
-            content_type = content.get("type")
-            if content_type not in {"output_text", "text"}:
-                continue
+    def iter_texts() -> Iterator[str]:
+        for item in response_json.get("output") or ():
+            for content in item.get("content") or ():
+                if content.get("type") not in {"output_text", "text"}:
+                    continue
 
-            text_field = content.get("text")
-            if isinstance(text_field, str):
-                texts.append(text_field)
-            elif isinstance(text_field, dict):
-                value = text_field.get("value")
-                if isinstance(value, str):
-                    texts.append(value)
+                text_field = content.get("text")
+                if isinstance(text_field, str):
+                    yield text_field
+                elif isinstance(text_field, dict):
+                    value = text_field.get("value")
+                    if isinstance(value, str):
+                        yield value
 
-    return "\n".join(texts).strip()
+    return "\n".join(iter_texts()).strip()
 
 
-_DIFF_FENCE = re.compile(r"```diff\s*(.*?)\s*```", re.DOTALL)
+_DIFF_FENCE_OPEN = "```diff"
+_FENCE = "```"
 
 
 def _extract_patch(text: str) -> str | None:
-    match = _DIFF_FENCE.search(text)
-    if match:
-        return match.group(1).strip() + "\n"
+    start = text.find(_DIFF_FENCE_OPEN)
+    if start != -1:
+        start += len(_DIFF_FENCE_OPEN)
+        end = text.find(_FENCE, start)
+        if end != -1:
+            return text[start:end].strip() + "\n"
 
     idx = text.find("diff --git ")
     if idx != -1:
@@ -420,77 +789,84 @@ def _extract_patch(text: str) -> str | None:
     return None
 
 
-def _extract_post_apply_steps(text: str) -> str | None:
-    lines = text.splitlines()
-    start_idx: int | None = None
-    for i, line in enumerate(lines):
-        if re.match(r"^\s*#+\s*Post-apply steps\s*$", line, re.IGNORECASE) or re.match(
-            r"^\s*Post-apply steps\s*:?\s*$",
-            line,
-            re.IGNORECASE,
-        ):
-            start_idx = i + 1
-            break
+_POST_APPLY_TITLE = "post-apply steps"
+_MARKDOWN_HEADER = re.compile(r"^\s*#+\s*\S+")
 
-    if start_idx is None:
-        return None
 
+def _is_post_apply_header(line: str) -> bool:
+    # Matches "## Post-apply steps" or "Post-apply steps:" (case-insensitive) without a regex.
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return stripped.lstrip("#").lstrip().casefold() == _POST_APPLY_TITLE
+    if stripped.endswith(":"):
+        stripped = stripped[:-1].rstrip()
+    return stripped.casefold() == _POST_APPLY_TITLE
+
+
+def _extract_post_apply_steps(text: str) -> str | None:
+    in_section = False
     collected: list[str] = []
-    for line in lines[start_idx:]:
-        if re.match(r"^\s*#+\s*\S+", line):
+    for line in text.splitlines():
+        if not in_section:
+            in_section = _is_post_apply_header(line)
+            continue
+        if line.lstrip().startswith("#") and _MARKDOWN_HEADER.match(line):
             break
         collected.append(line)
 
+    if not in_section:
+        return None
+
     steps = "\n".join(collected).strip()
     return steps if steps else None
 
 
+_DIFF_PATH_HEADER = re.compile(
+    r"^(?:diff --git [^\S\n]*(\S+)[^\S\n]+(\S+)|(?:---|\+\+\+) [^\S\n]*(\S+))",
+    re.MULTILINE,
+)
+
+
 def _diff_touches_git_dir(diff_text: str) -> bool:
     def is_git_dir_path(path: str) -> bool:
         return path == ".git" or path.startswith(".git/")
 
-    for line in diff_text.splitlines():
-        if line.startswith("diff --git "):
-            parts = line.split()
-            if len(parts) >= 4:
-                a_path = parts[2]
-                b_path = parts[3]
-                if a_path.startswith("a/"):
-                    a_path = a_path[2:]
-                if b_path.startswith("b/"):
-                    b_path = b_path[2:]
-                if is_git_dir_path(a_path) or is_git_dir_path(b_path):
-                    return True
+    for match in _DIFF_PATH_HEADER.finditer(diff_text):
+        a_path, b_path, path = match.groups()
+        if path is None:
+            if a_path.startswith("a/"):
+                a_path = a_path[2:]
+            if b_path.startswith("b/"):
+                b_path = b_path[2:]
+            if is_git_dir_path(a_path) or is_git_dir_path(b_path):
+                return True
             continue
 
-        if line.startswith("--- ") or line.startswith("+++ "):
-            parts = line.split()
-            if len(parts) >= 2:
-                path = parts[1]
-                if path == "/dev/null":
-                    continue
-                if path.startswith("a/") or path.startswith("b/"):
-                    path = path[2:]
-                if is_git_dir_path(path):
-                    return True
+        if path == "/dev/null":
+            continue
+        if path.startswith("a/") or path.startswith("b/"):
+            path = path[2:]
+        if is_git_dir_path(path):
+            return True
     return False
 
 
 def _apply_patch(repo_root: Path, patch_path: Path) -> None:
+    # stdout is never used; stderr stays raw bytes and is only decoded for the error message.
     cmd = ["git", "-C", str(repo_root), "apply", "--whitespace=fix", str(patch_path)]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     if proc.returncode == 0:
         return
 
     cmd_3way = ["git", "-C", str(repo_root), "apply", "--3way", "--whitespace=fix", str(patch_path)]
-    proc_3way = subprocess.run(cmd_3way, capture_output=True, text=True)
+    proc_3way = subprocess.run(cmd_3way, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     if proc_3way.returncode == 0:
         return
 
     raise RuntimeError(
         "Failed to apply patch.\n"
-        f"git apply error:\n{proc.stderr}\n"
-        f"git apply --3way error:\n{proc_3way.stderr}"
+        f"git apply error:\n{proc.stderr.decode('utf-8', errors='replace')}\n"
+        f"git apply --3way error:\n{proc_3way.stderr.decode('utf-8', errors='replace')}"
     )
 
 
@@ -522,6 +898,25 @@ def main() -> int:
         default=DEFAULT_MAX_ZIP_BYTES,
         help=f"Abort if bundle.zip exceeds this size (default: {DEFAULT_MAX_ZIP_BYTES}).",
     )
+    parser.add_argument(
+        "--compressor",
+        choices=["zlib", "libdeflate", "store"],
+        default=DEFAULT_COMPRESSOR,
+        help=f"How to compress bundle.zip members (default: {DEFAULT_COMPRESSOR}; libdeflate needs `pip install deflate`).",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=None,
+        help="DEFLATE level: 0-9 for zlib, 0-12 for libdeflate (default: 6). "
+        "Lower is faster; ignored with --compressor store.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Compress bundle members in this many worker processes; 0 = one per CPU (default: {DEFAULT_JOBS}).",
+    )
     parser.add_argument("--bundle-only", action="store_true", help="Only create bundle.zip and exit.")
     parser.add_argument(
         "--manual",
@@ -564,6 +959,11 @@ def main() -> int:
 
     args = parser.parse_args()
 
+    max_level = MAX_COMPRESSION_LEVELS.get(args.compressor)
+    if args.compression_level is not None and max_level is not None and not 0 <= args.compression_level <= max_level:
+        _eprint(f"[ERROR] --compression-level for {args.compressor} must be between 0 and {max_level}.")
+        return 2
+
     repo_root = _git_repo_root(Path(args.repo).resolve())
     if args.artifact_dir:
         artifact_dir = Path(args.artifact_dir)
@@ -578,6 +978,9 @@ def main() -> int:
         artifact_dir=artifact_dir,
         include_git=args.include_git,
         max_zip_bytes=args.max_zip_bytes,
+        compressor=args.compressor,
+        compression_level=args.compression_level,
+        jobs=args.jobs,
     )
     _eprint(f"[OK] Created bundle: {bundle_zip} ({bundle_zip.stat().st_size} bytes)")
 
@@ -652,10 +1055,19 @@ def main() -> int:
 
     client = OpenAIClient(api_key=api_key, base_url=args.base_url)
 
-    file_id = client.upload_zip(bundle_zip)
-    try:
+    upload_cache_path = artifact_dir / UPLOAD_CACHE_FILENAME
+    upload_cache = _load_upload_cache(upload_cache_path)
+    bundle_digest = _sha256_file(bundle_zip)
+    cached_file_id = upload_cache.get(bundle_digest)
+    if cached_file_id and client.file_exists(cached_file_id):
+        file_id = cached_file_id
+        _eprint(f"[OK] Reusing uploaded bundle (file_id={file_id})")
+    else:
+        file_id = client.upload_zip(bundle_zip)
         _eprint(f"[OK] Uploaded bundle (file_id={file_id})")
-
+        upload_cache[bundle_digest] = file_id
+        _save_upload_cache(upload_cache_path, upload_cache)
+    try:
         prompt = _build_review_prompt(args.message)
         payload = {
             "model": args.model,
@@ -698,9 +1110,12 @@ def main() -> int:
     finally:
         if not args.no_cleanup:
             client.delete_file(file_id)
+            upload_cache.pop(bundle_digest, None)
+            _save_upload_cache(upload_cache_path, upload_cache)
+        client.close()
 
     artifact_dir.mkdir(parents=True, exist_ok=True)
-    (artifact_dir / "response.json").write_text(json.dumps(response_json, indent=2, sort_keys=True))
+    _write_json(artifact_dir / "response.json", response_json)
 
     text = _extract_output_text(response_json)
     if not text: